@@ -60,7 +60,7 @@ class CommandsConfig():
         # git user and email as default for author data
         name, email = CommandsConfig.git_user()
         context = {'git_name': name, 'git_email': email}
-        commands_str = Template(commands_str).render(**context)
+        commands_str = Template(commands_str).render(context)
         commands_dict = json.loads(commands_str)
         return commands_dict
 
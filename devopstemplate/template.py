@@ -3,13 +3,170 @@
     - defines how components/files will be installed according to user requests
 """
 import os
+import re
 import logging
 import json
+import functools
+import types
 from jinja2 import Environment, PackageLoader, select_autoescape
-from jinja2 import Template
+from jinja2 import TemplateNotFound
 from devopstemplate import pkg
 
 
+# Directory in the distribution package that contains the template files
+_TEMPLATE_DNAME = 'template'
+# Environment for rendering file paths from template.json. Paths are plain
+# strings without autoescaping (equivalent to jinja2.Template defaults).
+_PATH_ENV = Environment()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_path(template_fpath):
+    """Compile a file path from template.json to a Jinja2 template
+
+    Paths are compiled only once per process and reused by subsequent calls.
+
+    Params:
+        template_fpath: String specifying the file path (can contain template
+            variables)
+    Returns: jinja2.Template object for rendering the file path
+    """
+    return _PATH_ENV.from_string(template_fpath)
+
+
+def _is_literal_path(template_fpath):
+    """Check whether a file path from template.json contains Jinja2 syntax
+
+    Params:
+        template_fpath: String specifying the file path
+    Returns: True if the path does not contain template syntax and does not
+        have to be rendered
+    """
+    return not any(marker in template_fpath
+                   for marker in (_PATH_ENV.variable_start_string,
+                                  _PATH_ENV.block_start_string,
+                                  _PATH_ENV.comment_start_string))
+
+
+# Matches simple variable expressions in file paths, e.g., {{project_slug}}
+_PATH_VAR_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+# Names that Jinja2 interprets as constants instead of variables
+_JINJA_CONSTANTS = frozenset(('true', 'false', 'none',
+                              'True', 'False', 'None'))
+
+
+def _render_path(template_fpath, path_template, context):
+    """Render a file path from template.json with Jinja2
+
+    Params:
+        template_fpath: String specifying the file path
+        path_template: jinja2.Template object compiled from template_fpath
+        context: Dictionary with the context for rendering the file path
+    Returns: rendered file path
+    """
+    # pylint: disable=unused-argument
+    # same signature as _cookiecutter_path
+    return path_template.render(context)
+
+
+def _cookiecutter_path(template_fpath, path_template, cookiecutterconfig):
+    """Render a file path from template.json for the cookiecutter template
+
+    File paths typically only contain simple variable expressions which are
+    substituted by their values in cookiecutterconfig ('{{cookiecutter.KEY}}')
+    without Jinja2. Paths with other template syntax or variables that are
+    not defined in cookiecutterconfig are rendered with Jinja2.
+
+    Params:
+        template_fpath: String specifying the file path (can contain template
+            variables)
+        path_template: jinja2.Template object compiled from template_fpath
+        cookiecutterconfig: Dictionary mapping variable names to cookiecutter
+            template variables (strings)
+    Returns: rendered file path
+    """
+    # The path must only consist of plain text and simple variables which are
+    # defined in cookiecutterconfig
+    plain_text = _PATH_VAR_RE.sub('', template_fpath)
+    var_name_list = _PATH_VAR_RE.findall(template_fpath)
+    if (_is_literal_path(plain_text) and
+            all(var_name in cookiecutterconfig and
+                var_name not in _JINJA_CONSTANTS
+                for var_name in var_name_list)):
+        return _PATH_VAR_RE.sub(
+            lambda match: cookiecutterconfig[match.group(1)], template_fpath)
+    return path_template.render(cookiecutterconfig)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_env():
+    """Create the environment for rendering template files from the
+    distribution package.
+
+    The environment is shared by all DevOpsTemplate instances such that loaded
+    templates are compiled only once per process (templates are not modified
+    at runtime: no reloading, no cache eviction). It is created on first use
+    since the loader requires the template directory to be present.
+
+    Returns: jinja2.Environment object
+    """
+    # ATTENTION: using __package__ may only work as long as this module
+    # (template.py) is located in the top-level import directory
+    return Environment(loader=PackageLoader(__package__, _TEMPLATE_DNAME),
+                       autoescape=select_autoescape(default=True),
+                       auto_reload=False,
+                       cache_size=-1)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_template_dict():
+    """Load template.json which defines the template components
+
+    The file is parsed only once per process. The result is read-only in order
+    to prevent modifications that would affect other DevOpsTemplate instances.
+
+    Returns: mapping from component names to tuples of file paths
+    """
+    with pkg.stream('template.json') as handle:
+        template_dict = json.load(handle)
+    return types.MappingProxyType({comp: tuple(file_list)
+                                   for comp, file_list
+                                   in template_dict.items()})
+
+
+@functools.lru_cache(maxsize=1)
+def _load_installers():
+    """Prepare the installation of all components defined in template.json
+
+    Components are classified once according to their file paths:
+    'static': no path contains template syntax, paths are used as they are.
+    'dynamic': paths are pre-compiled to Jinja2 templates for rendering.
+        Paths without template syntax are kept as strings since rendering
+        would not change them.
+
+    Returns: mapping from component names to tuples
+        (kind, file paths, path templates)
+        with kind 'static' or 'dynamic' and path templates None for 'static'
+        components (file paths and path templates in the same order as in
+        template.json)
+    """
+    def prepare_path(template_fpath):
+        if _is_literal_path(template_fpath):
+            return template_fpath
+        return _compile_path(template_fpath)
+
+    installer_dict = {}
+    for comp, file_list in _load_template_dict().items():
+        if all(_is_literal_path(template_fpath)
+               for template_fpath in file_list):
+            installer_dict[comp] = ('static', file_list, None)
+        else:
+            path_template_list = tuple(prepare_path(template_fpath)
+                                       for template_fpath in file_list)
+            installer_dict[comp] = ('dynamic', file_list, path_template_list)
+    return types.MappingProxyType(installer_dict)
+
+
 class SkipFileError(FileExistsError):
     """Will be raised if a file that is to be created already exists and should
     be skipped according to user flags.
@@ -42,15 +199,8 @@ class DevOpsTemplate():
         self.__overwrite = overwrite_exists
         self.__skip = skip_exists
         self.__dry_run = dry_run
-        with pkg.stream('template.json') as handle:
-            self.__template_dict = json.load(handle)
-        self.__template_dname = 'template'
-        # ATTENTION: using __package__ may only work as long as this module
-        # (template.py) is located in the top-level import directory
-        loader = PackageLoader(__package__,
-                               self.__template_dname)
-        self.__env = Environment(loader=loader,
-                                 autoescape=select_autoescape(default=True))
+        self.__template_dname = _TEMPLATE_DNAME
+        self.__env = _get_env()
         # Create project base directory if not present
         self.__mkdir(projectdirectory)
 
@@ -69,9 +219,7 @@ class DevOpsTemplate():
         logger.info('Project name: %s', context['project_name'])
         logger.info('Package name: %s', context['project_slug'])
         # Install files for components
-        for component in components:
-            logger.debug(' # %s', component)
-            self.__install(component, context)
+        self.__install(components, context)
 
     def cookiecutter(self, context, components):
         """Create a new cookiecutter template from the DevOps template given
@@ -110,8 +258,7 @@ class DevOpsTemplate():
         if not os.path.exists(readme_fpath):
             if not self.__dry_run:
                 with open(readme_fpath, 'w', encoding='utf-8') as handle:
-                    readme_content_list = ['# Cookiecutter PyDevops']
-                    handle.writelines(readme_content_list)
+                    handle.write('# Cookiecutter PyDevops\n')
             logger.info('project:%s', readme_fpath)
 
         # Generate hooks directory with pre/post generation scripts if required
@@ -131,9 +278,10 @@ class DevOpsTemplate():
         # simplifies handling of jinja2 template syntax {{ }}
         cookiecutterconfig = {key: '{{cookiecutter.%s}}' % key
                               for key in context.keys()}
-        # Install all template components
-        for comp in components:
-            self.__install(comp, cookiecutterconfig)
+        # Install all template components, file paths are rendered by
+        # substituting cookiecutter template variables
+        self.__install(components, cookiecutterconfig,
+                       render_path=_cookiecutter_path)
 
         # Revert project directory to cookiecutter root directory
         self.__projectdir = cookiecutter_rootdir
@@ -149,27 +297,44 @@ class DevOpsTemplate():
                 main.manage)
             components: Template components that should be installed.
         """
-        logger = logging.getLogger('DevOpsTemplate.manage')
         # Install files for components
-        for component in components:
-            logger.debug(' # %s', component)
-            self.__install(component, context)
+        self.__install(components, context)
 
-    def __install(self, template_component, context):
-        """Copy and render files for a template component
+    def __install(self, template_components, context,
+                  render_path=_render_path):
+        """Copy and render files for template components
         Components, i.e., file to install, are defined in 'template.json' which
-        is represented by __template_dict.
+        is represented by _load_installers.
 
         Params:
-            template_component: String specifying the component to install.
+            template_components: List of strings specifying the components to
+                install.
             context: Dictionary with the context for rendering Jinja2
                 templates.
+            render_path: Function for rendering file paths that contain
+                template syntax (see _render_path, _cookiecutter_path).
+        Raises:
+            FileNotFoundError, FileExistsError: see __render. Installation
+                stops at the first failing file, files before it have been
+                written to the project.
         """
-        file_list = self.__template_dict[template_component]
-        for template_fpath in file_list:
-            # Render file path (paths can contain template variables)
-            project_fpath = Template(template_fpath).render(**context)
-            self.__render(template_fpath, project_fpath, context)
+        logger = logging.getLogger('DevOpsTemplate.__install')
+        for component in template_components:
+            logger.debug(' # %s', component)
+            installer = _load_installers()[component]
+            kind, file_list, path_template_list = installer
+            if kind == 'static':
+                # Paths do not contain template variables
+                path_template_list = file_list
+            for template_fpath, path_template in zip(file_list,
+                                                     path_template_list):
+                # Render file path (paths can contain template variables)
+                if isinstance(path_template, str):
+                    project_fpath = path_template
+                else:
+                    project_fpath = render_path(template_fpath,
+                                                path_template, context)
+                self.__render(template_fpath, project_fpath, context)
 
     def __mkdir(self, project_dname):
         """Create a directory within the project if not present
@@ -179,12 +344,18 @@ class DevOpsTemplate():
         """
         logger = logging.getLogger('DevOpsTemplate.__mkdir')
         project_dpath = os.path.join(self.__projectdir, project_dname)
-        if not os.path.exists(project_dpath):
-            logger.info('creating directory: %s', project_dpath)
-            if not self.__dry_run:
-                os.makedirs(project_dpath)
+        if self.__dry_run:
+            exists = os.path.exists(project_dpath)
         else:
+            try:
+                os.makedirs(project_dpath)
+                exists = False
+            except FileExistsError:
+                exists = True
+        if exists:
             logger.debug('directory %s exists', project_dpath)
+        else:
+            logger.info('creating directory: %s', project_dpath)
 
     def __render(self, pkg_fname, project_fname, context):
         """Render template to project according to overwrite/skip class members
@@ -201,10 +372,14 @@ class DevOpsTemplate():
                 and skip-exists=False, overwrite-exists=False
         """
         logger = logging.getLogger('DevOpsTemplate.__render')
-        pkg_fpath = os.path.join(self.__template_dname, pkg_fname)
-        if not pkg.exists(pkg_fpath):
+        # Load template, the environment caches loaded templates such that
+        # every file is read from the distribution package only once
+        try:
+            template = self.__env.get_template(pkg_fname)
+        except TemplateNotFound as err:
+            pkg_fpath = os.path.join(self.__template_dname, pkg_fname)
             raise FileNotFoundError(f'File {pkg_fpath} not available in '
-                                    'distribution package')
+                                    'distribution package') from err
         project_fpath = os.path.join(self.__projectdir, project_fname)
         try:
             self.__check_project_file(project_fpath)
@@ -213,13 +388,12 @@ class DevOpsTemplate():
             return
         if not self.__dry_run:
             # Create parent directories if not present
-            parent_dname = os.path.dirname(project_fpath)
-            if not os.path.exists(parent_dname):
-                os.makedirs(parent_dname)
-            # Load and instantiate template
-            template = self.__env.get_template(pkg_fname)
-            with open(project_fpath, 'w', encoding='utf-8') as project_fh:
-                template.stream(**context).dump(project_fh)
+            os.makedirs(os.path.dirname(project_fpath), exist_ok=True)
+            # Template files are small: render in memory, encode and write
+            # at once in binary mode (no text layer)
+            project_contents = template.render(context).encode('utf-8')
+            with open(project_fpath, 'wb') as project_fh:
+                project_fh.write(project_contents)
         logger.info('template:%s  ->  project:%s', pkg_fname, project_fpath)
 
     def __check_project_file(self, project_fpath):
@@ -236,10 +410,13 @@ class DevOpsTemplate():
             FileExistsError: if the file that should be created already exists
                 and should not be overwritten.
         """
-        if os.path.exists(project_fpath) and self.__skip:
-            raise SkipFileError(f'File {project_fpath} already exists, skip.')
-        if os.path.exists(project_fpath) and not self.__overwrite:
-            raise FileExistsError(f'File {project_fpath} already exists, exit.'
-                                  ' (use --skip-exists or --overwrite-exists'
-                                  ' to control behavior)')
+        if os.path.exists(project_fpath):
+            if self.__skip:
+                raise SkipFileError(f'File {project_fpath} already exists, '
+                                    'skip.')
+            if not self.__overwrite:
+                raise FileExistsError(f'File {project_fpath} already exists, '
+                                      'exit. (use --skip-exists or '
+                                      '--overwrite-exists to control '
+                                      'behavior)')
         return True
@@ -6,6 +6,9 @@ import itertools
 import json
 from setuptools import setup
 
+# Matches the version definition in __init__.py (at the start of a line)
+_VER_RE = re.compile(r"__version__ ?= ?['\"]([^'\"]*)['\"]")
+
 
 def parse_version():
     """Parse version number from __init__.py in top-level import package
@@ -21,12 +24,12 @@ def parse_version():
     """
     init_fpath = os.path.join('devopstemplate', '__init__.py')
     with open(init_fpath, 'r', encoding='utf-8') as handle:
-        init_contents = handle.read()
-        ver_re = r"^__version__ ?= ?['\"]([^'\"]*)['\"]"
-        match = re.search(ver_re, init_contents, re.M)
-        if match:
-            version = match.group(1)
-            return version
+        # Scan line by line and stop at the first match
+        for line in handle:
+            match = _VER_RE.match(line)
+            if match:
+                version = match.group(1)
+                return version
         raise ValueError('Could not parse version string')
 
 
@@ -35,7 +38,8 @@ def parse_template_index():
     """
     with open('devopstemplate/template.json', 'r', encoding='utf-8') as handle:
         template_dict = json.load(handle)
-        template_index = list(itertools.chain(*template_dict.values()))
+        template_index = list(
+            itertools.chain.from_iterable(template_dict.values()))
     return template_index
 
 
@@ -89,8 +93,9 @@ setup(name='devopstemplate',
                     },
       package_data={
           # Include data files in devopstemplate package
-          # the file template.index specifies file paths relative to
-          # devopstemplate/template directory
+          # the file template.json specifies file paths relative to
+          # devopstemplate/template directory (only these template files
+          # are packaged)
           'devopstemplate': (['template.json', 'commands.json'] +
                              [f'template/{fpath}'
                               for fpath in TEMPLATE_INDEX]),
@@ -57,7 +57,8 @@ class PackageResourcesTest(unittest.TestCase):
     def test_template_json(self):
         with pkg.stream('template.json') as fh:
             template_dict = json.load(fh)
-            filestr_list = list(itertools.chain(*template_dict.values()))
+            filestr_list = list(
+                itertools.chain.from_iterable(template_dict.values()))
 
         self.assertTrue(pkg.isdir('template'))
         for fpath in filestr_list:
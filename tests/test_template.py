@@ -6,21 +6,39 @@ or exclude these tests
 """
 import unittest
 import os
+import shutil
 import itertools
 import tempfile
 import json
 from pathlib import Path
-from jinja2 import Template
+from jinja2 import Environment, Template
 from conftest import ref_file_head
 from conftest import ref_template_head
 import devopstemplate.pkg as pkg
 from devopstemplate.template import DevOpsTemplate
+from devopstemplate.template import _compile_path, _cookiecutter_path
+
+# Environment for rendering file paths from template.json
+_ENV = Environment(autoescape=False)
 
 
 class TestDevOpsTemplate(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        with pkg.stream('template.json') as fh:
+            cls.__template_dict = json.load(fh)
+        # Shared root directory, every test uses its own sub-directory
+        cls.__tmproot = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.__tmproot)
+
     def setUp(self):
         self.__ref_template_index_head = ref_file_head()
+        self.__tmpdirname = os.path.join(self.__tmproot, self._testMethodName)
+        os.makedirs(self.__tmpdirname)
 
     def test_version(self):
         import devopstemplate
@@ -31,71 +49,71 @@ class TestDevOpsTemplate(unittest.TestCase):
             self.assertGreaterEqual(int(part), 0)
 
     def test_render_file(self):
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            tmp_fname = 'tmp_file'
-            tmp_fpath = os.path.join(tmpdirname, tmp_fname)
-            template._DevOpsTemplate__render('MANIFEST.in', tmp_fpath,
-                                             context={})
-            with open(tmp_fpath, 'r') as tmp_fh:
-                contents = tmp_fh.read()
-                content_list = contents.splitlines()
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        tmp_fname = 'tmp_file'
+        tmp_fpath = os.path.join(tmpdirname, tmp_fname)
+        template._DevOpsTemplate__render('MANIFEST.in', tmp_fpath,
+                                         context={})
+        with open(tmp_fpath, 'r') as tmp_fh:
+            contents = tmp_fh.read()
+            content_list = contents.splitlines()
 
         self.assertEqual(content_list[:len(self.__ref_template_index_head)],
                          self.__ref_template_index_head)
 
     def test_render_template(self):
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            tmp_fname = 'tmp_file'
-            tmp_fpath = os.path.join(tmpdirname, tmp_fname)
-            project_slug = 'project'
-            context = {'project_slug': project_slug}
-            template._DevOpsTemplate__render('{{project_slug}}/__init__.py',
-                                             tmp_fpath,
-                                             context=context)
-            with open(tmp_fpath, 'r') as tmp_fh:
-                contents = tmp_fh.read()
-                content_list = contents.splitlines()
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        tmp_fname = 'tmp_file'
+        tmp_fpath = os.path.join(tmpdirname, tmp_fname)
+        project_slug = 'project'
+        context = {'project_slug': project_slug}
+        template._DevOpsTemplate__render('{{project_slug}}/__init__.py',
+                                         tmp_fpath,
+                                         context=context)
+        with open(tmp_fpath, 'r') as tmp_fh:
+            contents = tmp_fh.read()
+            content_list = contents.splitlines()
         ref_template_list = ref_template_head(project_slug)
         self.assertEqual(content_list[:len(ref_template_list)],
                          ref_template_list)
 
     def test_render_exists(self):
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            tmp_fname = 'tmp_file'
-            tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
-            tmp_path.touch()
-            with self.assertRaises(FileExistsError):
-                template._DevOpsTemplate__render('MANIFEST.in', tmp_path,
-                                                 context={})
-
-    def test_render_skip(self):
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname,
-                                      skip_exists=True)
-            tmp_fname = 'tmp_file'
-            tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
-            tmp_path.touch()
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        tmp_fname = 'tmp_file'
+        tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
+        tmp_path.touch()
+        with self.assertRaises(FileExistsError):
             template._DevOpsTemplate__render('MANIFEST.in', tmp_path,
                                              context={})
-            with open(tmp_path, 'r') as tmp_fh:
-                contents = tmp_fh.read()
-                self.assertEqual(contents, '')
+
+    def test_render_skip(self):
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname,
+                                  skip_exists=True)
+        tmp_fname = 'tmp_file'
+        tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
+        tmp_path.touch()
+        template._DevOpsTemplate__render('MANIFEST.in', tmp_path,
+                                         context={})
+        with open(tmp_path, 'r') as tmp_fh:
+            contents = tmp_fh.read()
+            self.assertEqual(contents, '')
 
     def test_render_overwrite(self):
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname,
-                                      overwrite_exists=True)
-            tmp_fname = 'tmp_file'
-            tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
-            tmp_path.touch()
-            template._DevOpsTemplate__render('MANIFEST.in', tmp_path,
-                                             context={})
-            with open(tmp_path, 'r') as tmp_fh:
-                contents = tmp_fh.read()
-                content_list = contents.splitlines()
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname,
+                                  overwrite_exists=True)
+        tmp_fname = 'tmp_file'
+        tmp_path = Path(os.path.join(tmpdirname, tmp_fname))
+        tmp_path.touch()
+        template._DevOpsTemplate__render('MANIFEST.in', tmp_path,
+                                         context={})
+        with open(tmp_path, 'r') as tmp_fh:
+            contents = tmp_fh.read()
+            content_list = contents.splitlines()
 
         self.assertEqual(content_list[:len(self.__ref_template_index_head)],
                          self.__ref_template_index_head)
@@ -131,23 +149,21 @@ class TestDevOpsTemplate(unittest.TestCase):
                       'sonar']
         # Generate reference data
         project_file_list = []
-        with pkg.stream('template.json') as fh:
-            template_dict = json.load(fh)
-            for fpath in itertools.chain(*(template_dict[comp]
-                                           for comp in components)):
-                # Render path
-                fpath_template = Template(fpath)
-                fpath_rendered = fpath_template.render(**context)
-                project_file_list.append(fpath_rendered)
+        for fpath in itertools.chain.from_iterable(self.__template_dict[comp]
+                                                   for comp in components):
+            # Render path
+            fpath_template = _ENV.from_string(fpath)
+            fpath_rendered = fpath_template.render(context)
+            project_file_list.append(fpath_rendered)
 
         # Create test project
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            template.create(context, components)
-            # Make sure all files exist
-            for fpath in project_file_list:
-                fpath = os.path.join(tmpdirname, fpath)
-                self.assertTrue(os.path.exists(fpath))
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        template.create(context, components)
+        # Make sure all files exist
+        for fpath in project_file_list:
+            fpath = os.path.join(tmpdirname, fpath)
+            self.assertTrue(os.path.exists(fpath))
 
     def test_manage(self):
 
@@ -156,26 +172,47 @@ class TestDevOpsTemplate(unittest.TestCase):
         components = ['git', 'sonar', 'mongo']
         # Generate reference data
         project_file_list = []
-        with pkg.stream('template.json') as fh:
-            template_dict = json.load(fh)
-            for fpath in itertools.chain(*(template_dict[comp]
-                                           for comp in components)):
-                # Render path
-                fpath_template = Template(fpath)
-                fpath_rendered = fpath_template.render(**context)
-                project_file_list.append(fpath_rendered)
+        for fpath in itertools.chain.from_iterable(self.__template_dict[comp]
+                                                   for comp in components):
+            # Render path
+            fpath_template = _ENV.from_string(fpath)
+            fpath_rendered = fpath_template.render(context)
+            project_file_list.append(fpath_rendered)
 
         # Create test project
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            # Create 'make' component which is required to test 'manage'
-            template._DevOpsTemplate__install('make', context)
-            # Run 'manage'
-            template.manage(context, components)
-            # Make sure all files exist
-            for fpath in project_file_list:
-                fpath = os.path.join(tmpdirname, fpath)
-                self.assertTrue(os.path.exists(fpath))
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        # Create 'make' component which is required to test 'manage'
+        template._DevOpsTemplate__install(['make'], context)
+        # Run 'manage'
+        template.manage(context, components)
+        # Make sure all files exist
+        for fpath in project_file_list:
+            fpath = os.path.join(tmpdirname, fpath)
+            self.assertTrue(os.path.exists(fpath))
+
+    def test_create_exists(self):
+
+        # Define test project
+        context = {'project_name': 'project',
+                   'project_slug': 'project'}
+        components = ['src', 'make', 'git']
+        # Create test project with existing Makefile (component 'make')
+        tmpdirname = self.__tmpdirname
+        Path(os.path.join(tmpdirname, 'Makefile')).touch()
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        with self.assertRaises(FileExistsError):
+            template.create(context, components)
+        # Files before the conflict have been written, files after the
+        # conflict have not been written
+        for fpath in self.__template_dict['src']:
+            fpath = _ENV.from_string(fpath).render(context)
+            self.assertTrue(os.path.exists(os.path.join(tmpdirname, fpath)))
+        for fpath in self.__template_dict['git']:
+            self.assertFalse(os.path.exists(os.path.join(tmpdirname, fpath)))
+        # Existing file has not been modified
+        with open(os.path.join(tmpdirname, 'Makefile'), 'r') as fh:
+            self.assertEqual(fh.read(), '')
 
     def test_cookiecutter(self):
 
@@ -204,68 +241,104 @@ class TestDevOpsTemplate(unittest.TestCase):
         cookiecutterconfig = {key: '{{cookiecutter.%s}}' % key
                               for key in context.keys()}
         project_file_list = []
-        with pkg.stream('template.json') as fh:
-            template_dict = json.load(fh)
-            for fpath in itertools.chain(*(template_dict[comp]
-                                           for comp in components)):
-                # Render path
-                fpath_template = Template(fpath)
-                fpath_rendered = fpath_template.render(**cookiecutterconfig)
-                project_file_list.append(fpath_rendered)
+        for fpath in itertools.chain.from_iterable(self.__template_dict[comp]
+                                                   for comp in components):
+            # Render path
+            fpath_template = _ENV.from_string(fpath)
+            fpath_rendered = fpath_template.render(cookiecutterconfig)
+            project_file_list.append(fpath_rendered)
 
         # Create test cookiecutter template
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            template = DevOpsTemplate(projectdirectory=tmpdirname)
-            template.cookiecutter(context, components)
-            # Make sure all files exist
-            projectdirname = os.path.join(tmpdirname,
-                                          '{{cookiecutter.project_name}}')
-            for fpath in project_file_list:
-                fpath = os.path.join(projectdirname, fpath)
-                self.assertTrue(os.path.exists(fpath))
-
-            # Check template __init__.py
-            pkgdirname = os.path.join(projectdirname,
-                                      '{{cookiecutter.project_slug}}')
-            init_fpath = os.path.join(pkgdirname, '__init__.py')
-            with open(init_fpath, 'r') as fh:
-                init_contents = fh.read()
-            tests_dpath = os.path.dirname(__file__)
-            init_ref_fpath = os.path.join(tests_dpath, 'template_init.ref')
-            with open(init_ref_fpath, 'r') as fh:
-                init_ref_contents = fh.read()
-            self.assertEqual(init_contents, init_ref_contents)
-
-            # Check cookiecutter files
-            cookiecutter_json_fpath = os.path.join(tmpdirname,
-                                                   'cookiecutter.json')
-            self.assertTrue(os.path.exists(cookiecutter_json_fpath))
-            with open(cookiecutter_json_fpath, 'r') as fh:
-                cookiecutter_json = json.load(fh)
-                self.assertEqual(cookiecutter_json, context)
-
-            self.assertTrue(os.path.exists(os.path.join(tmpdirname,
-                                                        'README.md')))
-
-            # Check that the DevOps template project directory is the unittest
-            # tmp directory
-            self.assertEqual(template._DevOpsTemplate__projectdir,
-                             tmpdirname)
+        tmpdirname = self.__tmpdirname
+        template = DevOpsTemplate(projectdirectory=tmpdirname)
+        template.cookiecutter(context, components)
+        # Make sure all files exist
+        projectdirname = os.path.join(tmpdirname,
+                                      '{{cookiecutter.project_name}}')
+        for fpath in project_file_list:
+            fpath = os.path.join(projectdirname, fpath)
+            self.assertTrue(os.path.exists(fpath))
+
+        # Check template __init__.py
+        pkgdirname = os.path.join(projectdirname,
+                                  '{{cookiecutter.project_slug}}')
+        init_fpath = os.path.join(pkgdirname, '__init__.py')
+        with open(init_fpath, 'r') as fh:
+            init_contents = fh.read()
+        tests_dpath = os.path.dirname(__file__)
+        init_ref_fpath = os.path.join(tests_dpath, 'template_init.ref')
+        with open(init_ref_fpath, 'r') as fh:
+            init_ref_contents = fh.read()
+        self.assertEqual(init_contents, init_ref_contents)
+
+        # Check cookiecutter files
+        cookiecutter_json_fpath = os.path.join(tmpdirname,
+                                               'cookiecutter.json')
+        self.assertTrue(os.path.exists(cookiecutter_json_fpath))
+        with open(cookiecutter_json_fpath, 'r') as fh:
+            cookiecutter_json = json.load(fh)
+            self.assertEqual(cookiecutter_json, context)
+
+        self.assertTrue(os.path.exists(os.path.join(tmpdirname,
+                                                    'README.md')))
+
+        # Check that the DevOps template project directory is the unittest
+        # tmp directory
+        self.assertEqual(template._DevOpsTemplate__projectdir,
+                         tmpdirname)
 
 
 class Jinja2RenderTest(unittest.TestCase):
 
     def test_render(self):
         context = {'project_slug': 'projectname', 'project_name': 'Name'}
-        text = Template('{{project_slug}}/__init__.py').render(**context)
+        text = Template('{{project_slug}}/__init__.py').render(context)
         self.assertEqual(text, 'projectname/__init__.py')
 
     def test_render_cc_templatevar(self):
         context = {'project_slug': '{{cookiecutter.project_name}}',
                    'project_name': 'Name'}
-        text = Template('{{project_slug}}/__init__.py').render(**context)
+        text = Template('{{project_slug}}/__init__.py').render(context)
         self.assertEqual(text, '{{cookiecutter.project_name}}/__init__.py')
 
+    def __render_cc_path(self, fpath):
+        cookiecutterconfig = {'project_slug': '{{cookiecutter.project_slug}}',
+                              'project_name': '{{cookiecutter.project_name}}'}
+        text = _cookiecutter_path(fpath, _compile_path(fpath),
+                                  cookiecutterconfig)
+        # Result must not differ from rendering with Jinja2
+        self.assertEqual(text, Template(fpath).render(cookiecutterconfig))
+        return text
+
+    def test_cc_path_var(self):
+        text = self.__render_cc_path('{{project_slug}}/__init__.py')
+        self.assertEqual(text, '{{cookiecutter.project_slug}}/__init__.py')
+
+    def test_cc_path_var_spaces(self):
+        text = self.__render_cc_path('{{ project_name }}/{{project_slug}}.py')
+        self.assertEqual(text, '{{cookiecutter.project_name}}/'
+                               '{{cookiecutter.project_slug}}.py')
+
+    def test_cc_path_undefined(self):
+        text = self.__render_cc_path('{{undefined_var}}/__init__.py')
+        self.assertEqual(text, '/__init__.py')
+
+    def test_cc_path_constant(self):
+        text = self.__render_cc_path('{{ true }}/{{none}}.py')
+        self.assertEqual(text, 'True/None.py')
+
+    def test_cc_path_filter(self):
+        text = self.__render_cc_path('{{project_slug|upper}}/__init__.py')
+        self.assertEqual(text, '{{COOKIECUTTER.PROJECT_SLUG}}/__init__.py')
+
+    def test_cc_path_dotted(self):
+        text = self.__render_cc_path('{{project_slug.upper()}}/__init__.py')
+        self.assertEqual(text, '{{COOKIECUTTER.PROJECT_SLUG}}/__init__.py')
+
+    def test_cc_path_literal(self):
+        text = self.__render_cc_path('sonarqube/README.md')
+        self.assertEqual(text, 'sonarqube/README.md')
+
 
 if __name__ == "__main__":
     unittest.main()